@@ -9,9 +9,12 @@ from io import BytesIO
 from flask import Flask, render_template, redirect, url_for, session, flash, request, jsonify, send_file, make_response
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy import event
 from functools import wraps
 from datetime import datetime, date, timezone
 from markupsafe import escape
+from werkzeug.security import generate_password_hash, check_password_hash
+from config import MAX_PASSWORD_LENGTH, BOOTSTRAP_ADMIN_HASH_METHOD
 
 # Initialize Flask
 app = Flask(__name__)
@@ -28,6 +31,17 @@ os.makedirs('instance', exist_ok=True)
 db = SQLAlchemy(app)
 migrate = Migrate(app, db)
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets screenings read while reports are written; NORMAL sync is safe under WAL"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.close()
+
+with app.app_context():
+    if db.engine.dialect.name == 'sqlite':
+        event.listen(db.engine, 'connect', _set_sqlite_pragmas)
+
 # Define models
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -35,7 +49,6 @@ class User(db.Model):
     password_hash = db.Column(db.String(120), nullable=False)
     
     def check_password(self, password):
-        from werkzeug.security import check_password_hash
         return check_password_hash(self.password_hash, password)
 
 class Client(db.Model):
@@ -146,6 +159,10 @@ def index():
 def login():
     if request.method == 'POST':
         password = request.form.get('password')
+        # Reject oversized input before it reaches the password hash
+        if not password or len(password) > MAX_PASSWORD_LENGTH:
+            flash('Invalid password.', 'error')
+            return render_template('login.html')
         user = User.query.filter_by(username='admin').first()
         if user and user.check_password(password):
             session['user_id'] = user.id
@@ -185,10 +202,9 @@ def check_sanctions():
             return jsonify({'error': 'Client name is required'}), 400
         
         # Use the enhanced sanctions service for matching
-        from app.enhanced_matcher import get_matcher_instance
+        from app.enhanced_matcher import find_matches_cached
         
-        matcher = get_matcher_instance()
-        matches = matcher.find_matches(client_name, threshold=70)
+        matches = find_matches_cached(client_name, threshold=70)
         
         screening_time = datetime.now(timezone.utc)
         
@@ -798,10 +814,9 @@ with app.app_context():
     db.create_all()
     
     # Create admin user if doesn't exist
-    from werkzeug.security import generate_password_hash
     admin = User.query.filter_by(username='admin').first()
     if not admin:
-        admin = User(username='admin', password_hash=generate_password_hash('admin123'))
+        admin = User(username='admin', password_hash=generate_password_hash('admin123', method=BOOTSTRAP_ADMIN_HASH_METHOD))
         db.session.add(admin)
         db.session.commit()
         print("✅ Admin user created (password: admin123)")
@@ -921,8 +936,6 @@ def api_institution_settings():
 @login_required
 def change_password():
     """Change admin password"""
-    from werkzeug.security import generate_password_hash
-    
     if request.method == 'POST':
         current_password = request.form.get('current_password', '').strip()
         new_password = request.form.get('new_password', '').strip()
@@ -1,7 +1,9 @@
 """
 Advanced Fuzzy Matching for Sanctions Screening
 """
-from thefuzz import fuzz, process as thefuzz_process
+import numpy as np
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
 import re
 from typing import List, Dict, Any
 
@@ -17,10 +19,15 @@ class OptimalFuzzyMatcher:
             self.names = [entity[self.name_key].lower().strip() 
                          for entity in self.clean_entities 
                          if entity.get(self.name_key)]
+            # Name -> first entity carrying it, so match results are resolved without a scan
+            self.entity_by_name = {}
+            for name, entity in zip(self.names, self.clean_entities):
+                self.entity_by_name.setdefault(name, entity)
             print(f"✅ Cleaned {len(self.clean_entities)} entities (removed {len(sanctions_data) - len(self.clean_entities)} garbage entries)")
         else:
             self.clean_entities = []
             self.names = []
+            self.entity_by_name = {}
     
     def _filter_garbage_entities(self, entities: List[Dict]) -> List[Dict]:
         """Filter out garbage entities that are parsing artifacts"""
@@ -114,32 +121,34 @@ class OptimalFuzzyMatcher:
         
         name_clean = name.lower().strip()
         all_matches = []
+        # Scores are compared rounded (as thefuzz returned them), so keep anything that rounds up
+        score_cutoff = max(0, threshold - 0.5)
         
         # Strategy 1: Direct fuzzy matching
         try:
-            direct_matches = thefuzz_process.extract(name_clean, self.names, limit=limit*2, scorer=fuzz.token_sort_ratio)
+            direct_matches = process.extract(name_clean, self.names, limit=limit*2, scorer=fuzz.token_sort_ratio, processor=default_process, score_cutoff=score_cutoff)
             all_matches.extend(direct_matches)
         except Exception as e:
             print(f"⚠️ Direct matching error: {e}")
         
         # Strategy 2: Partial matching for substrings
         try:
-            partial_matches = thefuzz_process.extract(name_clean, self.names, limit=limit, scorer=fuzz.partial_ratio)
+            partial_matches = process.extract(name_clean, self.names, limit=limit, scorer=fuzz.partial_ratio, processor=default_process, score_cutoff=score_cutoff)
             all_matches.extend(partial_matches)
         except Exception as e:
             print(f"⚠️ Partial matching error: {e}")
         
         # Strategy 3: Token set ratio (order independent)
         try:
-            token_matches = thefuzz_process.extract(name_clean, self.names, limit=limit, scorer=fuzz.token_set_ratio)
+            token_matches = process.extract(name_clean, self.names, limit=limit, scorer=fuzz.token_set_ratio, processor=default_process, score_cutoff=score_cutoff)
             all_matches.extend(token_matches)
         except Exception as e:
             print(f"⚠️ Token matching error: {e}")
         
         # Remove duplicates and filter by threshold
         unique_matches = {}
-        for match_name, score in all_matches:
-            if (score >= threshold and 
+        for match_name, score, _ in all_matches:
+            if (round(score) >= threshold and 
                 match_name not in unique_matches and
                 len(match_name) > 2):  # Additional length filter
                 unique_matches[match_name] = score
@@ -148,11 +157,7 @@ class OptimalFuzzyMatcher:
         results = []
         for match_name, score in unique_matches.items():
             # Find the original entity data
-            original_entity = next(
-                (entity for entity in self.clean_entities 
-                 if entity.get(self.name_key, '').lower().strip() == match_name),
-                None
-            )
+            original_entity = self.entity_by_name.get(match_name)
             
             if original_entity:
                 results.append({
@@ -170,6 +175,50 @@ class OptimalFuzzyMatcher:
         results.sort(key=lambda x: x['score'], reverse=True)
         return results[:limit]
     
+    def find_matches_batch(self, names: List[str], threshold: int = 75, limit: int = 10) -> List[List[Dict]]:
+        """Score many names against the index in one cdist call (one result list per name)"""
+        queries = [(name or '').lower().strip() for name in names]
+        if not queries:
+            return []
+        if not self.names:
+            return [[] for _ in queries]
+        
+        # Token set ratio (same scorer and preprocessing as find_matches) for the whole query x name matrix
+        scores = process.cdist(queries, self.names,
+                               scorer=fuzz.token_set_ratio,
+                               processor=default_process,
+                               score_cutoff=max(0, threshold - 0.5),
+                               dtype=np.float64,
+                               workers=-1)
+        
+        batch_results = []
+        for query, row in zip(queries, scores):
+            results = []
+            seen_names = set()
+            if query:
+                for idx in (-row).argsort(kind='stable'):
+                    score = float(row[idx])
+                    if round(score) < threshold or len(results) >= limit:
+                        break
+                    match_name = self.names[idx]
+                    if match_name in seen_names or len(match_name) <= 2:
+                        continue
+                    seen_names.add(match_name)
+                    entity = self.clean_entities[idx]
+                    results.append({
+                        'name': entity.get(self.name_key, 'Unknown'),
+                        'primary_name': entity.get(self.name_key, 'Unknown'),
+                        'score': score,
+                        'source': entity.get('source', 'Unknown'),
+                        'type': entity.get('type', 'Entity'),
+                        'countries': entity.get('countries', []),
+                        'id': entity.get('id', ''),
+                        'list_type': entity.get('list_type', '')
+                    })
+            batch_results.append(results)
+        
+        return batch_results
+    
     def get_matching_stats(self):
         """Get statistics about the matching system"""
         return {
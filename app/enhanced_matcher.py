@@ -14,8 +14,11 @@ Includes tiered risk scoring based on sanctioning authority:
 
 import re
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
-from fuzzywuzzy import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
 from unidecode import unidecode
 
 logger = logging.getLogger(__name__)
@@ -80,20 +83,28 @@ class EnhancedSanctionsMatcher:
         self.sanctions_entities = sanctions_entities
         self.name_index = []
         self._build_index()
+        # Parallel lists so layers 3 and 4 can be scored in one cdist call each
+        self.normalized_names = [entry['normalized'] for entry in self.name_index]
+        self.expanded_names = [self._expand_abbreviations(n) for n in self.normalized_names]
     
     def _build_index(self):
         """Build searchable index of all names from sanctions entities."""
         for entity in self.sanctions_entities:
             names = entity.get('names', [])
             primary_name = entity.get('primary_name', '')
+            # Used to group matches by list, normalized once here rather than per query;
+            # entities without a primary_name key group under the matched name instead
+            has_primary = 'primary_name' in entity
+            normalized_primary = self._normalize_name(primary_name)
             
             # Add primary name
             if primary_name and len(primary_name.strip()) > 1:
-                normalized = self._normalize_name(primary_name)
+                normalized = normalized_primary
                 tokens = self._tokenize(normalized)
                 self.name_index.append({
                     'original_name': primary_name,
                     'normalized': normalized,
+                    'normalized_primary': normalized_primary,
                     'tokens': tokens,
                     'entity': entity
                 })
@@ -106,6 +117,7 @@ class EnhancedSanctionsMatcher:
                     self.name_index.append({
                         'original_name': name,
                         'normalized': normalized,
+                        'normalized_primary': normalized_primary if has_primary else normalized,
                         'tokens': tokens,
                         'entity': entity
                     })
@@ -214,8 +226,14 @@ class EnhancedSanctionsMatcher:
         target_expanded = self._expand_abbreviations(target_normalized)
         
         # Use token_sort_ratio which is good for reordered words
-        score = fuzz.token_sort_ratio(query_expanded, target_expanded)
-        
+        score = fuzz.token_sort_ratio(query_expanded, target_expanded, processor=default_process)
+        return self._scale_phonetic_score(score)
+    
+    @staticmethod
+    def _scale_phonetic_score(score: float) -> Optional[float]:
+        """Map a raw token_sort_ratio onto the layer 3 range (75-84)."""
+        # Whole-number score, as fuzzywuzzy reported it, so boundary names keep matching
+        score = round(score)
         if score >= 75:
             # Scale to 75-84 range
             scaled_score = 75 + ((score - 75) * (9 / 25))
@@ -243,8 +261,13 @@ class EnhancedSanctionsMatcher:
         Returns score 70-74, None if threshold not met.
         """
         # token_set_ratio is good for subsets and different orderings
-        score = fuzz.token_set_ratio(query_normalized, target_normalized)
-        
+        score = fuzz.token_set_ratio(query_normalized, target_normalized, processor=default_process)
+        return self._scale_fuzzy_score(score)
+    
+    @staticmethod
+    def _scale_fuzzy_score(score: float) -> Optional[float]:
+        """Map a raw token_set_ratio onto the layer 4 range (70-74)."""
+        score = round(score)
         if score >= 70:
             # Scale to 70-74 range
             scaled_score = 70 + ((score - 70) * (4 / 30))
@@ -373,11 +396,24 @@ class EnhancedSanctionsMatcher:
         query_normalized = self._normalize_name(query)
         query_tokens = self._tokenize(query_normalized)
         
+        # Raw layer 3/4 scores for every indexed name, below-cutoff entries come back as 0
+        # (cutoffs sit half a point low so scores that round up to the layer floor survive)
+        phonetic_scores = process.cdist(
+            [self._expand_abbreviations(query_normalized)], self.expanded_names,
+            scorer=fuzz.token_sort_ratio, processor=default_process,
+            score_cutoff=74.5, dtype=np.float64
+        )[0]
+        fuzzy_scores = process.cdist(
+            [query_normalized], self.normalized_names,
+            scorer=fuzz.token_set_ratio, processor=default_process,
+            score_cutoff=69.5, dtype=np.float64
+        )[0]
+        
         # Collect all matches first, grouped by matched name to detect multi-jurisdictional
         all_matches = []
         name_to_lists = {}  # Track which lists each name appears on
         
-        for entry in self.name_index:
+        for i, entry in enumerate(self.name_index):
             target_normalized = entry['normalized']
             target_tokens = entry['tokens']
             entity = entry['entity']
@@ -400,16 +436,13 @@ class EnhancedSanctionsMatcher:
             
             # Layer 3: Phonetic match
             if score is None:
-                score = self._layer3_phonetic_match(
-                    query_normalized, query_tokens,
-                    target_normalized, target_tokens
-                )
+                score = self._scale_phonetic_score(float(phonetic_scores[i]))
                 if score is not None:
                     match_layer = 'phonetic'
             
             # Layer 4: Fuzzy match
             if score is None:
-                score = self._layer4_fuzzy_match(query_normalized, target_normalized)
+                score = self._scale_fuzzy_score(float(fuzzy_scores[i]))
                 if score is not None:
                     match_layer = 'fuzzy'
             
@@ -419,7 +452,7 @@ class EnhancedSanctionsMatcher:
                 primary_name = entity.get('primary_name', original_name)
                 
                 # Track which lists this name appears on (for multi-jurisdictional detection)
-                normalized_primary = self._normalize_name(primary_name)
+                normalized_primary = entry['normalized_primary']
                 if normalized_primary not in name_to_lists:
                     name_to_lists[normalized_primary] = set()
                 name_to_lists[normalized_primary].add(list_type)
@@ -486,6 +519,8 @@ class EnhancedSanctionsMatcher:
 
 # Global matcher instance
 _matcher_instance = None
+# Bumped on reload so cached screening results from old data are never reused
+_matcher_version = 0
 
 
 def get_matcher_instance() -> EnhancedSanctionsMatcher:
@@ -508,6 +543,22 @@ def get_matcher_instance() -> EnhancedSanctionsMatcher:
 
 def reload_matcher():
     """Force reload of the matcher with fresh sanctions data."""
-    global _matcher_instance
+    global _matcher_instance, _matcher_version
     _matcher_instance = None
+    _matcher_version += 1
     return get_matcher_instance()
+
+
+@lru_cache(maxsize=1024)
+def _score_name(name_key: str, threshold: int, version: int) -> Tuple[Dict[str, Any], ...]:
+    """Run the matcher for a normalized name; results are cached per data version."""
+    return tuple(get_matcher_instance().find_matches(name_key, threshold))
+
+
+def find_matches_cached(query: str, threshold: int = 70) -> List[Dict[str, Any]]:
+    """Same as find_matches on the global matcher, but repeated names hit the LRU cache."""
+    matcher = get_matcher_instance()
+    name_key = matcher._normalize_name(query)
+    if not name_key:
+        return []
+    return list(_score_name(name_key, threshold, _matcher_version))
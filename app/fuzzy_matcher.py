@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
-from fuzzywuzzy import fuzz, process
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
 import re
 from typing import List, Dict, Any, Tuple
 import logging
@@ -11,6 +13,9 @@ class AdvancedFuzzyMatcher:
     def __init__(self, sanctions_data: List[Dict[str, Any]]):
         self.sanctions_data = sanctions_data
         self.preprocessed_names = self._preprocess_names()
+        # Same data as two parallel lists, so the name column can be handed to rapidfuzz whole
+        self.normalized_names = [normalized for normalized, _ in self.preprocessed_names]
+        self.entities = [entity for _, entity in self.preprocessed_names]
         
     def _preprocess_names(self) -> List[Tuple[str, Dict]]:
         """Preprocess all sanction list names for efficient matching"""
@@ -60,12 +65,30 @@ class AdvancedFuzzyMatcher:
             
         normalized_search = self._normalize_name(search_name)
         
-        matches = []
+        # partial_ratio adds at most 30 points, so anything whose rounded token
+        # sort ratio is below this can't reach the threshold (0.01 of slack
+        # absorbs float rounding on exact-boundary scores)
+        min_sort_ratio = max(0.0, (threshold - 30) / 0.7 - 0.5 - 0.01)
         
-        for normalized_db_name, entity in self.preprocessed_names:
+        matches = []
+        if not self.normalized_names:
+            return matches
+        
+        # Token sort ratio for every name in one C++ call; score_cutoff lets rapidfuzz
+        # reject on length difference before scoring, and those come back as 0
+        sort_scores = process.cdist([normalized_search], self.normalized_names,
+                                    scorer=fuzz.token_sort_ratio, processor=default_process,
+                                    score_cutoff=min_sort_ratio, dtype=np.float64)[0]
+        candidates = (np.flatnonzero(sort_scores >= min_sort_ratio) if min_sort_ratio
+                      else range(len(self.normalized_names)))
+        
+        for idx in candidates:
+            normalized_db_name = self.normalized_names[idx]
+            entity = self.entities[idx]
             # Use multiple matching strategies
-            ratio = fuzz.token_sort_ratio(normalized_search, normalized_db_name)
-            partial_ratio = fuzz.partial_ratio(normalized_search, normalized_db_name)
+            # Whole-number scores, as fuzzywuzzy reported them, so the weighting is unchanged
+            ratio = round(float(sort_scores[idx]))
+            partial_ratio = round(fuzz.partial_ratio(normalized_search, normalized_db_name))
             
             # Weighted score (token sort ratio is generally more reliable)
             weighted_score = (ratio * 0.7) + (partial_ratio * 0.3)
@@ -117,6 +140,9 @@ class EnhancedFuzzyMatcher(AdvancedFuzzyMatcher):
                 variations = self._generate_variations(original_name)
                 for var in variations:
                     self.name_variations.append((self._normalize_name(var), entity))
+        
+        # Plain list of the variation strings for process.extract
+        self.variation_names = [normalized for normalized, _ in self.name_variations]
     
     def _generate_variations(self, name: str) -> List[str]:
         """Generate common name variations"""
@@ -141,21 +167,30 @@ class EnhancedFuzzyMatcher(AdvancedFuzzyMatcher):
         normalized_search = self._normalize_name(search_name)
         variation_matches = []
         
-        for normalized_var, entity in self.name_variations:
-            ratio = fuzz.token_sort_ratio(normalized_search, normalized_var)
-            if ratio >= threshold:
-                variation_matches.append({
-                    'entity': entity,
-                    'score': ratio,
-                    'match_type': 'variation',
-                    'match_details': {
-                        'ratio': ratio,
-                        'search_name': search_name,
-                        'matched_variation': normalized_var,
-                        'original_name': entity.get('name')
-                    }
-                })
-        
+        # One extract call scores every variation; score_cutoff drops the rest early
+        # (half a point low, since a ratio that rounds up to the threshold still matches)
+        scored = process.extract(normalized_search, self.variation_names,
+                                 scorer=fuzz.token_sort_ratio, processor=default_process,
+                                 score_cutoff=max(0, threshold - 0.5), limit=None)
+        
+        # Back to index order so deduplication keeps the same variation as before
+        for normalized_var, ratio, idx in sorted(scored, key=lambda m: m[2]):
+            ratio = round(ratio)
+            if ratio < threshold:
+                continue
+            entity = self.name_variations[idx][1]
+            variation_matches.append({
+                'entity': entity,
+                'score': ratio,
+                'match_type': 'variation',
+                'match_details': {
+                    'ratio': ratio,
+                    'search_name': search_name,
+                    'matched_variation': normalized_var,
+                    'original_name': entity.get('name')
+                }
+            })
+    
         # Combine and deduplicate matches
         all_matches = base_matches + variation_matches
         seen_entities = set()
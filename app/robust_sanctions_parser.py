@@ -1,11 +1,17 @@
 # Replace the entire app/robust_sanctions_parser.py file:
 import xml.etree.ElementTree as ET
-import pandas as pd
 import os
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, TYPE_CHECKING
 import logging
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Tag keywords that suggest an element (or its parent) holds an entity name
+NAME_TAG_RE = re.compile(r'name|title|entity|organization|company', re.IGNORECASE)
+PARENT_TAG_RE = re.compile(r'entity|organization|company|individual|party|subject', re.IGNORECASE)
+
 class RobustSanctionsParser:
     """Robust parser that specifically handles each sanctions format"""
     
@@ -220,15 +226,13 @@ class RobustSanctionsParser:
     def _is_likely_entity_name(self, element: ET.Element, text: str) -> bool:
         """Check if element context suggests this is an entity name"""
         # Check element tag
-        name_tags = ['name', 'firstName', 'lastName', 'title', 'entity', 'organization', 'company']
-        if any(tag in element.tag.lower() for tag in name_tags):
+        if NAME_TAG_RE.search(element.tag):
             return True
         
         # Check parent tags
         parent = element.getparent()
         if parent is not None:
-            parent_tags = ['entity', 'organization', 'company', 'individual', 'party', 'subject']
-            if any(tag in parent.tag.lower() for tag in parent_tags):
+            if PARENT_TAG_RE.search(parent.tag):
                 return True
         
         # Text characteristics of entity names
@@ -313,8 +317,10 @@ class RobustSanctionsParser:
         """Get all parsed entities"""
         return self.parsed_entities
     
-    def to_dataframe(self) -> pd.DataFrame:
+    def to_dataframe(self) -> 'pd.DataFrame':
         """Convert to DataFrame"""
+        import pandas as pd  # only needed for this export
+        
         if not self.parsed_entities:
             return pd.DataFrame()
         return pd.DataFrame(self.parsed_entities)
@@ -1,14 +1,31 @@
 import os
 import re
+import mmap
 import pickle
 import hashlib
 from pathlib import Path
+from itertools import islice
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import logging
+import numpy as np
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
 
 logger = logging.getLogger(__name__)
 
+# Tag keywords and value patterns used by the generic fallback parser
+GENERIC_NAME_TAG_RE = re.compile(
+    r'name|title|entity|individual|person|organization|company|designation|alias', re.IGNORECASE)
+VERSION_NUMBER_RE = re.compile(r'^\d+(\.\d+)*$')
+
+# Sanctions-list entity types each requested screening type may match
+COMPANY_QUERY_TYPES = frozenset({'company', 'organization'})
+COMPANY_DB_TYPES = frozenset({'entity', 'unknown', 'company', 'organization'})
+INDIVIDUAL_DB_TYPES = frozenset({'individual', 'unknown', 'person'})
+# Screening types matched with the lower organization threshold
+LENIENT_THRESHOLD_TYPES = frozenset({'company', 'organization', 'entity'})
+
 # Parser version - increment this when parser logic changes to invalidate cache
 PARSER_VERSION = 3  # v3: Added XML structure-based format auto-detection
 
@@ -36,8 +53,10 @@ class SanctionsService:
         """Get MD5 hash of file to detect changes"""
         hasher = hashlib.md5()
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hasher.update(chunk)
+            # Hash the mapped file in one update instead of thousands of 4 KB reads
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    hasher.update(mapped)
         return hasher.hexdigest()
     
     def _have_files_changed(self) -> bool:
@@ -139,13 +158,8 @@ class SanctionsService:
             logger.info("Detected EU format (namespace: eu.europa.ec/fpi/fsd/export)")
             return 'EU'
         
-        # Check for sanctionEntity elements (EU format marker)
-        has_sanction_entity = False
-        for elem in root.iter():
-            tag_name = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
-            if tag_name == 'sanctionEntity':
-                has_sanction_entity = True
-                break
+        # Check for sanctionEntity elements (EU format marker); stops at the first hit
+        has_sanction_entity = root.find('.//{*}sanctionEntity') is not None
         
         if has_sanction_entity:
             logger.info("Detected EU format (contains sanctionEntity elements)")
@@ -162,16 +176,12 @@ class SanctionsService:
             return 'OFAC'
         
         # Check for entities container element (OFAC marker)
-        for elem in root.iter():
-            tag_name = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
-            if tag_name == 'entities':
-                # Verify it has entity children (OFAC structure)
-                for child in elem:
-                    child_tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-                    if child_tag == 'entity':
-                        logger.info("Detected OFAC format (contains entities/entity structure)")
-                        return 'OFAC'
-                break
+        entities_elem = root.find('.//{*}entities')
+        if entities_elem is not None:
+            # Verify it has entity children (OFAC structure)
+            if entities_elem.find('{*}entity') is not None:
+                logger.info("Detected OFAC format (contains entities/entity structure)")
+                return 'OFAC'
         
         # UK/UN detection: both use Designations root
         if root_tag == 'Designations':
@@ -184,17 +194,15 @@ class SanctionsService:
             has_plain_name = False  # <Name> with direct text content
             
             # Sample up to 10 designations for efficiency
-            designations = root.findall('.//Designation')[:10]
+            designations = islice(root.iterfind('.//Designation'), 10)
             
             for designation in designations:
                 # Check for Name6 elements (common in both UK OFSI and UN formats)
-                name6_elems = designation.findall('.//Name6')
-                if name6_elems:
+                if designation.find('.//Name6') is not None:
                     has_name6 = True
                 
                 # Check for IndividualEntityShip elements (UN format marker)
-                ies_elems = designation.findall('.//IndividualEntityShip')
-                if ies_elems:
+                if designation.find('.//IndividualEntityShip') is not None:
                     has_individual_entity_ship = True
                 
                 # Check for plain Name elements with direct text content
@@ -566,15 +574,11 @@ class SanctionsService:
                 # More permissive name detection
                 if (len(text) >= 3 and len(text) <= 200 and  # Reasonable length
                     not text.startswith(('http', 'www.', '@')) and  # Not URLs/emails
-                    not re.match(r'^\d+(\.\d+)*$', text) and  # Not version numbers
+                    not VERSION_NUMBER_RE.match(text) and  # Not version numbers
                     any(c.isalpha() for c in text)):  # Contains letters
                     
                     # Check if element tag suggests it's a name
-                    tag_lower = elem.tag.lower()
-                    if any(keyword in tag_lower for keyword in [
-                        'name', 'title', 'entity', 'individual', 'person', 
-                        'organization', 'company', 'designation', 'alias'
-                    ]):
+                    if GENERIC_NAME_TAG_RE.search(elem.tag):
                         entities.append({
                             'source': source,
                             'list_type': 'Generic',
@@ -616,6 +620,7 @@ class OptimalFuzzyMatcher:
     def __init__(self, sanctions_entities: List[Dict[str, Any]]):
         self.sanctions_entities = sanctions_entities
         self.name_index = []
+        self.normalized_names = []  # Parallel to name_index, for batched scoring
         self._build_index()
     
     def _normalize_name(self, name: str) -> str:
@@ -644,6 +649,7 @@ class OptimalFuzzyMatcher:
                     'entity': entity,
                     'original_name': name
                 })
+                self.normalized_names.append(normalized)
     
     def _layer1_exact_match(self, query: str, target: str) -> Optional[float]:
         """Exact match layer"""
@@ -688,18 +694,13 @@ class OptimalFuzzyMatcher:
     
     def _layer4_fuzzy_match(self, query: str, target: str) -> Optional[float]:
         """Final fuzzy matching layer"""
-        try:
-            from fuzzywuzzy import fuzz
-        except ImportError:
-            return None
-        
         # Use fuzzy matching as final fallback
         score = max(
-            fuzz.token_sort_ratio(query, target),
-            fuzz.token_set_ratio(query, target)
+            fuzz.token_sort_ratio(query, target, processor=default_process),
+            fuzz.token_set_ratio(query, target, processor=default_process)
         )
         
-        return score if score >= 70 else None
+        return score if round(score) >= 70 else None
     
     def match_entity(self, search_name: str, entity_type: str = None, threshold: int = 70) -> List[Dict[str, Any]]:
         """Find matches for a given name"""
@@ -713,39 +714,51 @@ class OptimalFuzzyMatcher:
         
         # Lower threshold for company/organization matching since names vary more
         effective_threshold = threshold
-        if entity_type in ['company', 'organization', 'entity']:
+        if entity_type in LENIENT_THRESHOLD_TYPES:
             effective_threshold = min(threshold, 65)
         
         matches = []
         seen_entities = set()
-        
-        for normalized_db_name, entity, original_name in self.all_names:
+        if not self.normalized_names:
+            return matches
+        
+        # Score the query against every indexed name in C, then keep the best of both strategies
+        # Half a point of cutoff slack: decisions use the rounded score, as thefuzz returned it
+        score_kwargs = dict(processor=default_process, score_cutoff=max(0, effective_threshold - 0.5),
+                            dtype=np.float64)
+        sort_scores = process.cdist([normalized_search], self.normalized_names,
+                                    scorer=fuzz.token_sort_ratio, **score_kwargs)[0]
+        set_scores = process.cdist([normalized_search], self.normalized_names,
+                                   scorer=fuzz.token_set_ratio, **score_kwargs)[0]
+        
+        best_scores = np.maximum(sort_scores, set_scores)
+        
+        # Only names at or above the threshold reach the Python loop (kept in index order)
+        for idx in np.flatnonzero(np.round(best_scores) >= effective_threshold):
+            score = float(best_scores[idx])
+            indexed = self.name_index[idx]
+            entity = indexed['entity']
+            
             # Entity type filtering - map 'company' to include 'entity' type from sanctions lists
             if entity_type:
                 db_type = entity.get('type', '').lower()
                 # Companies should match 'entity' type in sanctions data
-                if entity_type in ['company', 'organization']:
-                    if db_type and db_type not in ['entity', 'unknown', 'company', 'organization']:
+                if entity_type in COMPANY_QUERY_TYPES:
+                    if db_type and db_type not in COMPANY_DB_TYPES:
                         continue
                 elif entity_type == 'individual':
-                    if db_type and db_type not in ['individual', 'unknown', 'person']:
+                    if db_type and db_type not in INDIVIDUAL_DB_TYPES:
                         continue
             
-            # Calculate score using multiple strategies
-            score1 = fuzz.token_sort_ratio(normalized_search, normalized_db_name)
-            score2 = fuzz.token_set_ratio(normalized_search, normalized_db_name)
-            score = max(score1, score2)
-            
-            if score >= effective_threshold:
-                entity_id = id(entity)
-                if entity_id not in seen_entities:
-                    seen_entities.add(entity_id)
-                    matches.append({
-                        'entity': entity,
-                        'score': score,
-                        'matched_name': original_name,
-                        'search_name': search_name
-                    })
+            entity_id = id(entity)
+            if entity_id not in seen_entities:
+                seen_entities.add(entity_id)
+                matches.append({
+                    'entity': entity,
+                    'score': score,
+                    'matched_name': indexed['original_name'],
+                    'search_name': search_name
+                })
         
         # Sort by score and return
         matches.sort(key=lambda x: x['score'], reverse=True)
@@ -755,12 +768,28 @@ class OptimalFuzzyMatcher:
 # Global instances
 sanctions_service = None
 fuzzy_matcher = None
+sanctions_stats = None  # Per-source counts, rebuilt only when data is (re)loaded
+
+def _build_sanctions_stats():
+    """Count loaded entities by source once per load"""
+    global sanctions_stats
+    sources = {}
+    for entity in sanctions_service.sanctions_entities:
+        source = entity['source']
+        sources[source] = sources.get(source, 0) + 1
+    
+    sanctions_stats = {
+        'total_entities': len(sanctions_service.sanctions_entities),
+        'last_loaded': sanctions_service.last_loaded.isoformat() if sanctions_service.last_loaded else None,
+        'sources': sources
+    }
 
 def init_sanctions_service():
     """Initialize the sanctions service"""
     global sanctions_service, fuzzy_matcher
     sanctions_service = SanctionsService()
     fuzzy_matcher = OptimalFuzzyMatcher(sanctions_service.sanctions_entities)
+    _build_sanctions_stats()
     return f"Sanctions service initialized with {len(sanctions_service.sanctions_entities)} entities"
 
 def get_sanctions_stats():
@@ -768,20 +797,11 @@ def get_sanctions_stats():
     if not sanctions_service:
         return {"error": "Sanctions service not initialized"}
     
-    stats = {
-        'total_entities': len(sanctions_service.sanctions_entities),
-        'last_loaded': sanctions_service.last_loaded.isoformat() if sanctions_service.last_loaded else None,
-        'sources': {}
-    }
-    
-    # Count by source
-    for entity in sanctions_service.sanctions_entities:
-        source = entity['source']
-        if source not in stats['sources']:
-            stats['sources'][source] = 0
-        stats['sources'][source] += 1
+    if sanctions_stats is None:
+        _build_sanctions_stats()
     
-    return stats
+    # Copy so callers can't alter the cached counts
+    return dict(sanctions_stats, sources=dict(sanctions_stats['sources']))
 
 def screen_entity(name: str, entity_type: str = None, threshold: int = 70):
     """Screen a single entity against sanctions"""
@@ -795,6 +815,7 @@ def reload_sanctions_data():
     global sanctions_service, fuzzy_matcher
     sanctions_service = SanctionsService()
     fuzzy_matcher = OptimalFuzzyMatcher(sanctions_service.sanctions_entities)
+    _build_sanctions_stats()
     
     # Also reload the enhanced matcher
     try:
@@ -1,10 +1,12 @@
 # app/universal_sanctions_parser.py
 import xml.etree.ElementTree as ET
-import pandas as pd
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, TYPE_CHECKING
 import logging
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 class UniversalSanctionsParser:
     """Universal parser that handles multiple sanctions file formats"""
     
@@ -280,6 +282,8 @@ class UniversalSanctionsParser:
     
     def _parse_csv_file(self, file_path: str):
         """Parse CSV file"""
+        import pandas as pd  # only needed for CSV input
+        
         try:
             df = pd.read_csv(file_path)
             filename = os.path.basename(file_path)
@@ -338,8 +342,10 @@ class UniversalSanctionsParser:
         """Get all parsed entities"""
         return self.parsed_entities
     
-    def to_dataframe(self) -> pd.DataFrame:
+    def to_dataframe(self) -> 'pd.DataFrame':
         """Convert parsed entities to DataFrame"""
+        import pandas as pd  # only needed for this export
+        
         if not self.parsed_entities:
             return pd.DataFrame()
         
@@ -1,13 +1,17 @@
 import xml.etree.ElementTree as ET
 from pathlib import Path
-import pandas as pd
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 import logging
 import re
 from datetime import datetime
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
+NAME_TAG_RE = re.compile(r'name|title|designation', re.IGNORECASE)
+
 class UniversalSanctionsParser:
     """Parse multiple XML sanctions list formats into unified structure"""
     
@@ -302,7 +306,7 @@ class UniversalSanctionsParser:
         for elem in root.iter():
             if (elem.text and 
                 len(elem.text.strip()) > 3 and 
-                any(keyword in elem.tag.lower() for keyword in ['name', 'title', 'designation'])):
+                NAME_TAG_RE.search(elem.tag)):
                 
                 name = elem.text.strip()
                 if self._looks_like_entity_name(name):
@@ -337,8 +341,10 @@ class UniversalSanctionsParser:
         elem = parent.find(xpath, namespaces)
         return elem.text.strip() if elem is not None and elem.text else None
     
-    def to_dataframe(self) -> pd.DataFrame:
+    def to_dataframe(self) -> 'pd.DataFrame':
         """Convert parsed entities to DataFrame"""
+        import pandas as pd  # only needed for this export
+        
         if not self.parsed_entities:
             return pd.DataFrame()
             
@@ -3,12 +3,20 @@ import secrets
 from datetime import datetime, timedelta
 from .database import db
 
+# Bump when the system_auth DDL or seed changes; stored in the database's PRAGMA user_version
+AUTH_SCHEMA_VERSION = 1
+
 class AuthSystem:
     def __init__(self):
         self._init_auth_table()
     
     def _init_auth_table(self):
         with db.get_cursor() as cursor:
+            # Already initialised: skip the DDL (and its write lock) on warm starts
+            cursor.execute('PRAGMA user_version')
+            if cursor.fetchone()[0] >= AUTH_SCHEMA_VERSION:
+                return
+            
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS system_auth (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -21,13 +29,12 @@ class AuthSystem:
                 )
             ''')
             
-            cursor.execute('SELECT system_id FROM system_auth LIMIT 1')
-            if not cursor.fetchone():
-                system_id = secrets.token_hex(16)
-                cursor.execute(
-                    'INSERT INTO system_auth (system_id, master_password_hash) VALUES (?, ?)',
-                    (system_id, None)  # None inserts as NULL, indicating unset
-                )
+            # Single row keyed on id=1: created on first run, ignored afterwards
+            cursor.execute(
+                'INSERT OR IGNORE INTO system_auth (id, system_id, master_password_hash) VALUES (1, ?, ?)',
+                (secrets.token_hex(16), None)  # None inserts as NULL, indicating unset
+            )
+            cursor.execute(f'PRAGMA user_version = {AUTH_SCHEMA_VERSION}')
     
     def setup_master_password(self, password):
         with db.get_cursor() as cursor:
@@ -1,6 +1,14 @@
 import os
 import secrets
 
+# Longest password accepted at login; longer input is refused before it is hashed
+MAX_PASSWORD_LENGTH = 256
+
+# Hash method for the bootstrap admin account. Its default password is public,
+# so a slow hash buys nothing there; one pbkdf2 round keeps first start fast.
+# Passwords users set later (app.py change_password) keep Werkzeug's default.
+BOOTSTRAP_ADMIN_HASH_METHOD = 'pbkdf2:sha256:1'
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or secrets.token_hex(32)
     DATABASE = 'mkweli_aml.db'
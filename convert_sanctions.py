@@ -5,11 +5,22 @@ Converts various formats to compatible CSV for import
 """
 
 import xml.etree.ElementTree as ET
-import pandas as pd
+import csv
 import sys
 import os
 from pathlib import Path
 
+CSV_COLUMNS = ['id', 'name', 'additional_info']
+
+def write_entries_csv(entries, output_csv):
+    """
+    Write converted entries straight to CSV (no intermediate DataFrame)
+    """
+    with open(output_csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        writer.writerows((e['id'], e['name'], e['additional_info']) for e in entries)
+
 def convert_xml_to_csv(xml_file, output_csv):
     """
     Convert XML sanctions list to CSV format
@@ -71,8 +82,7 @@ def convert_xml_to_csv(xml_file, output_csv):
                     data.append(entry)
         
         if data:
-            df = pd.DataFrame(data)
-            df.to_csv(output_csv, index=False)
+            write_entries_csv(data, output_csv)
             print(f"✅ Successfully converted {len(data)} entries to {output_csv}")
             return True
         else:
@@ -86,53 +96,87 @@ def convert_xml_to_csv(xml_file, output_csv):
         print(f"❌ Error converting XML: {str(e)}")
         return False
 
+def _read_xlsx_rows(excel_file, sheet_name=0):
+    """
+    Stream an .xlsx sheet with openpyxl in read-only mode: yields the header row, then data rows
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+        for row in ws.iter_rows(values_only=True):
+            # Read-only sheets can report trailing blank rows; skip them like pandas does
+            if any(value is not None for value in row):
+                yield row
+    finally:
+        wb.close()
+
+def _read_xls_rows(excel_file, sheet_name=0):
+    """
+    Legacy .xls workbooks still go through pandas; yields the header row, then data rows
+    """
+    import pandas as pd
+
+    df = pd.read_excel(excel_file, sheet_name=sheet_name)
+    yield tuple(df.columns)
+    # Swap NaN/NaT for None across the whole frame at once rather than per cell
+    df = df.astype(object).where(df.notna(), None)
+    yield from df.itertuples(index=False, name=None)
+
 def convert_excel_to_csv(excel_file, output_csv, sheet_name=0):
     """
     Convert Excel files to CSV format
     """
     try:
-        df = pd.read_excel(excel_file, sheet_name=sheet_name)
+        if Path(excel_file).suffix.lower() == '.xlsx':
+            rows = _read_xlsx_rows(excel_file, sheet_name)
+        else:
+            rows = _read_xls_rows(excel_file, sheet_name)
+        
+        header = next(rows, None) or ()
+        columns = [str(col) if col is not None else f'Unnamed: {i}' for i, col in enumerate(header)]
         
         # Try to identify columns
-        name_col = None
-        id_col = None
+        name_idx = None
+        id_idx = None
         
-        for col in df.columns:
-            col_lower = str(col).lower()
+        for i, col in enumerate(columns):
+            col_lower = col.lower()
             if any(term in col_lower for term in ['name', 'designation', 'title', 'individual']):
-                name_col = col
+                name_idx = i
             elif any(term in col_lower for term in ['id', 'reference', 'number', 'dataid']):
-                id_col = col
+                id_idx = i
         
-        if name_col is None and len(df.columns) > 0:
-            name_col = df.columns[0]  # Use first column as name
+        if name_idx is None and len(columns) > 0:
+            name_idx = 0  # Use first column as name
         
-        if id_col is None:
-            # Generate IDs
-            df['generated_id'] = [f'ROW_{i}' for i in range(len(df))]
-            id_col = 'generated_id'
+        other_idx = [i for i in range(len(columns)) if i != name_idx and i != id_idx]
         
-        # Create clean dataframe with required columns
+        # Build entries row by row; IDs are generated when there is no ID column
         clean_data = []
-        for index, row in df.iterrows():
+        for index, row in enumerate(rows):
+            row_id = row[id_idx] if id_idx is not None and id_idx < len(row) else None
+            name = row[name_idx] if name_idx is not None and name_idx < len(row) else None
             entry = {
-                'id': str(row[id_col]) if id_col in df.columns and pd.notna(row[id_col]) else f'ROW_{index}',
-                'name': str(row[name_col]) if name_col in df.columns and pd.notna(row[name_col]) else f'Entry_{index}'
+                'id': str(row_id) if row_id is not None else f'ROW_{index}',
+                'name': str(name) if name is not None else f'Entry_{index}'
             }
             
             # Build additional info from other columns
             other_info = []
-            for col in df.columns:
-                if col != name_col and col != id_col and pd.notna(row[col]):
-                    other_info.append(f"{col}: {row[col]}")
+            for i in other_idx:
+                if i < len(row) and row[i] is not None:
+                    other_info.append(f"{columns[i]}: {row[i]}")
+                    if len(other_info) == 3:  # Limit to first 3 fields
+                        break
             
-            entry['additional_info'] = ' | '.join(other_info[:3])  # Limit to first 3 fields
+            entry['additional_info'] = ' | '.join(other_info)
             clean_data.append(entry)
         
-        clean_df = pd.DataFrame(clean_data)
-        clean_df.to_csv(output_csv, index=False)
+        write_entries_csv(clean_data, output_csv)
         print(f"✅ Successfully converted Excel file to {output_csv}")
-        print(f"📊 Found {len(clean_df)} entries")
+        print(f"📊 Found {len(clean_data)} entries")
         return True
     except Exception as e:
         print(f"❌ Error converting Excel: {str(e)}")
@@ -1,108 +1,149 @@
 #!/usr/bin/env python3
 """Deep debug XML parsing to find name fields"""
 
-import xml.etree.ElementTree as ET
+import os
+import sys
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree
 from pathlib import Path
 
-def deep_debug_xml():
-    """Find actual name fields in XML structures"""
-    data_dir = Path("data")
-    
-    for xml_file in data_dir.glob('*.xml'):
-        print(f"\n🔍 Deep debugging {xml_file.name}:")
-        try:
-            tree = ET.parse(xml_file)
-            root = tree.getroot()
-            
-            if 'eu' in xml_file.name.lower():
-                # EU specific debugging
-                print("   EU Structure Analysis:")
-                ns = {'eu': 'http://eu.europa.ec/fpi/fsd/export'}
+EU_NS = 'http://eu.europa.ec/fpi/fsd/export'
+OFAC_NS = 'https://sanctionslistservice.ofac.treas.gov/api/PublicationPreview/exports/ENHANCED_XML'
+
+# Compiled once and reused for every entity
+EU_NAMEALIAS = etree.XPath('.//eu:nameAlias', namespaces={'eu': EU_NS})
+EU_WHOLENAME = etree.XPath('.//eu:wholeName', namespaces={'eu': EU_NS})
+EU_ALIASNAME = etree.XPath('.//eu:aliasName', namespaces={'eu': EU_NS})
+EU_SUBJECTTYPE = etree.XPath('.//eu:subjectType', namespaces={'eu': EU_NS})
+OFAC_NAME = etree.XPath('.//ofac:name', namespaces={'ofac': OFAC_NS})
+OFAC_AKA = etree.XPath('.//ofac:aka', namespaces={'ofac': OFAC_NS})
+OFAC_PRIMARY = etree.XPath('.//ofac:primaryDisplayName', namespaces={'ofac': OFAC_NS})
+OFAC_ALIAS = etree.XPath('.//ofac:alias', namespaces={'ofac': OFAC_NS})
+OFAC_TYPE = etree.XPath('.//ofac:type', namespaces={'ofac': OFAC_NS})
+
+def iter_elements(xml_file, tag):
+    """Stream elements with the given tag, dropping each subtree once handled"""
+    context = etree.iterparse(str(xml_file), events=('end',), tag=tag, huge_tree=True)
+    for _, elem in context:
+        yield elem
+        elem.clear(keep_tail=True)
+        # Drop already-processed siblings so memory stays at one entity
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+def debug_xml_file(xml_file):
+    """Collect the debug report for one XML file as a list of lines"""
+    out = []
+    out.append(f"\n🔍 Deep debugging {xml_file.name}:")
+    try:
+        if 'eu' in xml_file.name.lower():
+            # EU specific debugging
+            out.append("   EU Structure Analysis:")
+            entities = iter_elements(xml_file, f'{{{EU_NS}}}sanctionEntity')
+            shown = 0
+            for entity in islice(entities, 3):  # Only show first 3
+                out.append(f"   Entity {shown}:")
                 
-                count = 0
-                for entity in root.findall('.//eu:sanctionEntity', ns):
-                    if count < 3:  # Only show first 3
-                        print(f"   Entity {count}:")
-                        
-                        # Look for nameAlias
-                        for name_alias in entity.findall('.//eu:nameAlias', ns):
-                            print(f"     Found nameAlias")
-                            for name_elem in name_alias.findall('.//eu:wholeName', ns):
-                                if name_elem.text:
-                                    print(f"       wholeName: '{name_elem.text.strip()}'")
-                            
-                            for name_elem in name_alias.findall('.//eu:aliasName', ns):
-                                if name_elem.text:
-                                    print(f"       aliasName: '{name_elem.text.strip()}'")
-                        
-                        # Look for subjectType
-                        for subj_type in entity.findall('.//eu:subjectType', ns):
-                            print(f"     subjectType code: {subj_type.get('code')}")
+                # Look for nameAlias
+                for name_alias in EU_NAMEALIAS(entity):
+                    out.append(f"     Found nameAlias")
+                    for name_elem in EU_WHOLENAME(name_alias):
+                        if name_elem.text:
+                            out.append(f"       wholeName: '{name_elem.text.strip()}'")
                     
-                    count += 1
+                    for name_elem in EU_ALIASNAME(name_alias):
+                        if name_elem.text:
+                            out.append(f"       aliasName: '{name_elem.text.strip()}'")
+                
+                # Look for subjectType
+                for subj_type in EU_SUBJECTTYPE(entity):
+                    out.append(f"     subjectType code: {subj_type.get('code')}")
                 
-                print(f"   Total EU entities found: {count}")
+                shown += 1
             
-            elif 'un' in xml_file.name.lower():
-                # UN specific debugging (same structure as UK)
-                print("   UN Structure Analysis:")
-                count = 0
-                for designation in root.findall('.//Designation'):
-                    if count < 3:  # Only show first 3
-                        print(f"   Designation {count}:")
-                        
-                        # Look for all text elements in designation
-                        for elem in designation.iter():
-                            if elem.text and elem.text.strip() and len(elem.text.strip()) > 3:
-                                if not elem.tag == 'Designation':  # Skip the root designation tag
-                                    print(f"     {elem.tag}: '{elem.text.strip()[:60]}...'")
-                    
-                    count += 1
-                print(f"   Total UN designations: {count}")
+            # Count the remaining elements without inspecting them
+            count = shown + sum(1 for _ in entities)
+            
+            out.append(f"   Total EU entities found: {count}")
+        
+        elif 'un' in xml_file.name.lower():
+            # UN specific debugging (same structure as UK)
+            out.append("   UN Structure Analysis:")
+            designations = iter_elements(xml_file, 'Designation')
+            shown = 0
+            for designation in islice(designations, 3):  # Only show first 3
+                out.append(f"   Designation {shown}:")
+                
+                # Look for all text elements in designation
+                for elem in designation.iter():
+                    if elem.text and elem.text.strip() and len(elem.text.strip()) > 3:
+                        if not elem.tag == 'Designation':  # Skip the root designation tag
+                            out.append(f"     {elem.tag}: '{elem.text.strip()[:60]}...'")
+                
+                shown += 1
             
-            elif 'ofac' in xml_file.name.lower():
-                # OFAC specific debugging
-                print("   OFAC Structure Analysis:")
-                ns = {'ofac': 'https://sanctionslistservice.ofac.treas.gov/api/PublicationPreview/exports/ENHANCED_XML'}
+            # Count the remaining elements without inspecting them
+            count = shown + sum(1 for _ in designations)
+            out.append(f"   Total UN designations: {count}")
+        
+        elif 'ofac' in xml_file.name.lower():
+            # OFAC specific debugging
+            out.append("   OFAC Structure Analysis:")
+            entities = iter_elements(xml_file, f'{{{OFAC_NS}}}entity')
+            shown = 0
+            for entity in islice(entities, 2):  # Only show first 2
+                out.append(f"   Entity {shown}:")
                 
-                # Find entities element
-                entities_elem = root.find('.//ofac:entities', ns)
-                if entities_elem is not None:
-                    print(f"   Found entities element with {len(entities_elem)} children")
+                # Look for names
+                for name_elem in OFAC_NAME(entity):
+                    out.append(f"     Found name element")
                     
-                    count = 0
-                    for entity in entities_elem.findall('.//ofac:entity', ns):
-                        if count < 2:  # Only show first 2
-                            print(f"   Entity {count}:")
-                            
-                            # Look for names
-                            for name_elem in entity.findall('.//ofac:name', ns):
-                                print(f"     Found name element")
-                                
-                                for aka in name_elem.findall('.//ofac:aka', ns):
-                                    print(f"       Found aka")
-                                    
-                                    for primary in aka.findall('.//ofac:primaryDisplayName', ns):
-                                        if primary.text:
-                                            print(f"         primaryDisplayName: '{primary.text.strip()}'")
-                                    
-                                    for alias in aka.findall('.//ofac:alias', ns):
-                                        if alias.text:
-                                            print(f"         alias: '{alias.text.strip()}'")
-                            
-                            # Look for type
-                            for type_elem in entity.findall('.//ofac:type', ns):
-                                if type_elem.text:
-                                    print(f"     Type: {type_elem.text.strip()}")
+                    for aka in OFAC_AKA(name_elem):
+                        out.append(f"       Found aka")
                         
-                        count += 1
-                    
-                    print(f"   Total OFAC entities: {count}")
-                else:
-                    print("   ❌ No entities element found")
+                        for primary in OFAC_PRIMARY(aka):
+                            if primary.text:
+                                out.append(f"         primaryDisplayName: '{primary.text.strip()}'")
+                        
+                        for alias in OFAC_ALIAS(aka):
+                            if alias.text:
+                                out.append(f"         alias: '{alias.text.strip()}'")
+                
+                # Look for type
+                for type_elem in OFAC_TYPE(entity):
+                    if type_elem.text:
+                        out.append(f"     Type: {type_elem.text.strip()}")
+                
+                shown += 1
+            
+            # Count the remaining elements without inspecting them
+            count = shown + sum(1 for _ in entities)
             
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
+            if count:
+                out.append(f"   Total OFAC entities: {count}")
+            else:
+                out.append("   ❌ No entities element found")
+        
+    except Exception as e:
+        out.append(f"   ❌ Error: {e}")
+    
+    return out
+
+def deep_debug_xml():
+    """Find actual name fields in XML structures"""
+    data_dir = Path("data")
+    xml_files = sorted(data_dir.glob('*.xml'))
+    if not xml_files:
+        return
+    
+    # Files are independent; parse them in parallel and collect reports in file order
+    with ThreadPoolExecutor(max_workers=min(len(xml_files), os.cpu_count() or 1)) as executor:
+        reports = ['\n'.join(report) for report in executor.map(debug_xml_file, xml_files)]
+    
+    # One write and flush instead of a print() per line
+    sys.stdout.write('\n'.join(reports) + '\n')
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     deep_debug_xml()
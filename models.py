@@ -1,10 +1,22 @@
 # models.py - DB models with validation/sanitization (security). Single responsibility: Define schema.
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 import re
 from datetime import datetime
 
 from extensions import db
 
+# Argon2id with the OWASP-recommended minimum (19 MiB, 2 passes)
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+_USERNAME_RE = re.compile(r'^[\w.@+-]+$')
+_PASSWORD_UPPER_RE = re.compile(r'[A-Z]')
+_PASSWORD_DIGIT_RE = re.compile(r'[0-9]')
+_PASSWORD_SPECIAL_RE = re.compile(r'[!@#$%^&*]')
+_PHONE_RE = re.compile(r'^\+?[\d\s-]{7,20}$')
+_TAX_RE = re.compile(r'^[\w-]{5,20}$')
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(150), unique=True, nullable=False)
@@ -18,17 +30,23 @@ class User(db.Model):
     @staticmethod
     def sanitize_username(username):
         username = username.strip()
-        if len(username) < 3 or len(username) > 150 or not re.match(r'^[\w.@+-]+$', username):
+        if len(username) < 3 or len(username) > 150 or not _USERNAME_RE.match(username):
             raise ValueError("Invalid username: 3-150 chars, alphanumeric with @.+-.")
         return username.lower()
 
     def set_password(self, password):
         password = password.strip()
-        if len(password) < 12 or not re.search(r'[A-Z]', password) or not re.search(r'[0-9]', password) or not re.search(r'[!@#$%^&*]', password):
+        if len(password) < 12 or not _PASSWORD_UPPER_RE.search(password) or not _PASSWORD_DIGIT_RE.search(password) or not _PASSWORD_SPECIAL_RE.search(password):
             raise ValueError("Password must be 12+ chars with uppercase, digit, and special char.")
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = _password_hasher.hash(password)
 
     def check_password(self, password):
+        if self.password_hash.startswith('$argon2'):
+            try:
+                return _password_hasher.verify(self.password_hash, password)
+            except (VerificationError, InvalidHashError):
+                return False
+        # Hashes stored before the switch to argon2 are Werkzeug pbkdf2 strings
         return check_password_hash(self.password_hash, password)
 
 class UserDetails(db.Model):
@@ -52,7 +70,7 @@ class UserDetails(db.Model):
     def _validate_phone(phone):
         if phone:
             phone_clean = phone.strip()
-            if not re.match(r'^\+?[\d\s-]{7,20}$', phone_clean):
+            if not _PHONE_RE.match(phone_clean):
                 raise ValueError("Invalid phone format. Use: +1-234-567-8900 or similar.")
             return phone_clean
         return None
@@ -61,7 +79,7 @@ class UserDetails(db.Model):
     def _validate_tax_reg(tax_reg):
         if tax_reg:
             tax_clean = tax_reg.strip()
-            if not re.match(r'^[\w-]{5,20}$', tax_clean):
+            if not _TAX_RE.match(tax_clean):
                 raise ValueError("Invalid tax/registration format. Use 5-20 alphanumeric or hyphens.")
             return tax_clean
         return None
@@ -86,12 +104,19 @@ class Log(db.Model):
 class Individual(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     reference_number = db.Column(db.String(50), unique=True, nullable=False)
-    name = db.Column(db.String(255), index=True)
+    name = db.Column(db.String(255))
     dob = db.Column(db.Date)
     nationality = db.Column(db.String(100))
     listed_on = db.Column(db.Date)
     source = db.Column(db.String(50))
 
+    # perform_screening's substring search can't seek, but it can scan the
+    # covering (name, dob, nationality) index instead of the table. Its
+    # leading name column also serves plain name lookups.
+    __table_args__ = (
+        db.Index('ix_individual_screening', name, dob, nationality),
+    )
+
 class Entity(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     reference_number = db.Column(db.String(50), unique=True, nullable=False)
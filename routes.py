@@ -7,8 +7,14 @@ from extensions import db
 from utils import update_sanctions_lists
 from flask import jsonify
 from datetime import datetime
+from sqlalchemy.orm import joinedload
 from app.sanctions_service import screen_entity, get_sanctions_stats
 from app.sanctions_service import reload_sanctions_data
+from config import MAX_PASSWORD_LENGTH
+
+# Client types accepted from the screening form, mapped onto matcher entity types
+INDIVIDUAL_CLIENT_TYPES = frozenset({'individual', 'person'})
+COMPANY_CLIENT_TYPES = frozenset({'company', 'organization', 'corporation', 'business'})
 
 def login_required(f):
     @wraps(f)
@@ -26,6 +32,10 @@ def login():
     if request.method == 'POST':
         try:
             password = request.form.get('password')
+            # Don't spend a hash computation on empty or oversized input
+            if not password or len(password) > MAX_PASSWORD_LENGTH:
+                flash('Invalid master password.', 'error')
+                return render_template('login.html')
             # Hardcoded username since we only have one admin user
             user = User.query.filter_by(username='admin').first()
             if user and user.check_password(password):
@@ -57,6 +67,51 @@ def index():
 def dashboard():
     return render_template('dashboard.html')
 
+@main.route('/sanctions-lists')
+@login_required
+def sanctions_lists():
+    data = session.get('sanctions_data', {})
+    return render_template('sanctions_lists.html', data=data)
+
+@main.route('/settings', methods=['GET', 'POST'])
+@login_required
+def settings():
+    # The view always reads user_details, so fetch it in the same query
+    user = db.session.get(User, session['user_id'], options=[joinedload(User.user_details)])
+    form = UserDetailsForm()
+    
+    if form.validate_on_submit():
+        try:
+            if not user.user_details:
+                user_details = UserDetails(
+                    user_id=user.id,
+                    org_company=form.org_company.data,
+                    address=form.address.data,
+                    phone=form.phone.data,
+                    tax_reg=form.tax_reg.data
+                )
+                db.session.add(user_details)
+            else:
+                user.user_details.org_company = form.org_company.data
+                user.user_details.address = form.address.data
+                user.user_details.phone = form.phone.data
+                user.user_details.tax_reg = form.tax_reg.data
+            db.session.commit()
+            flash('Settings saved successfully!', 'success')
+            return redirect(url_for('main.settings'))
+        except ValueError as e:
+            flash(f'Validation error: {str(e)}', 'error')
+        except Exception:
+            db.session.rollback()
+            flash('Error saving settings—try again.', 'error')
+    elif request.method == 'GET' and user.user_details:
+        form.org_company.data = user.user_details.org_company
+        form.address.data = user.user_details.address
+        form.phone.data = user.user_details.phone
+        form.tax_reg.data = user.user_details.tax_reg
+    
+    return render_template('settings.html', form=form)
+
 @main.route('/check_sanctions', methods=['POST'])
 def check_sanctions():
     """Check client against sanctions lists"""
@@ -70,9 +125,9 @@ def check_sanctions():
         
         # Determine entity type for optimal matching
         entity_type = None
-        if client_type in ['individual', 'person']:
+        if client_type in INDIVIDUAL_CLIENT_TYPES:
             entity_type = 'individual'
-        elif client_type in ['company', 'organization', 'corporation', 'business']:
+        elif client_type in COMPANY_CLIENT_TYPES:
             entity_type = 'company'
         
         # Screen against sanctions (70% threshold for better matching)
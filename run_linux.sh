@@ -1,18 +1,17 @@
 #!/bin/bash
+# MkweliAML Linux/Mac Runner
+
 if [ ! -d "venv" ]; then
   echo "Creating venv..."
   python3 -m venv venv
 fi
 source venv/bin/activate
-python install_dependencies.py  # Auto-install deps if missing
-python app.py
-=======
-# MkweliAML Linux/Mac Runner
 
-# Activate venv if exists
-if [ -f venv/bin/activate ]; then
-    source venv/bin/activate
+# One resolver pass for all dependencies; prefer wheels and skip bytecode compilation.
+# Skipped when requirements.txt is unchanged since the last successful install.
+REQ_STAMP="venv/.requirements.sha256"
+if ! sha256sum --status -c "$REQ_STAMP" 2>/dev/null; then
+  pip install --prefer-binary --no-compile -r requirements.txt && sha256sum requirements.txt > "$REQ_STAMP"
 fi
 
 python3 app.py
-
@@ -4,14 +4,23 @@ Complete Mkweli AML System - Fixed Version
 """
 import sys
 import os
-sys.path.append(os.path.dirname(__file__))
-sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+import glob
+import pickle
+import tempfile
+import threading
+# Make the project root and app/ importable once, at import time
+for _path in (os.path.dirname(__file__), os.path.join(os.path.dirname(__file__), 'app')):
+    if _path not in sys.path:
+        sys.path.append(_path)
 
 from flask import Flask, render_template, redirect, url_for, session, flash, request, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 from functools import wraps
+from robust_sanctions_parser import RobustSanctionsParser
+from advanced_fuzzy_matcher import OptimalFuzzyMatcher
+from config import MAX_PASSWORD_LENGTH, BOOTSTRAP_ADMIN_HASH_METHOD
 
 # Initialize Flask
 app = Flask(__name__)
@@ -35,6 +44,71 @@ class Client(db.Model):
     name = db.Column(db.String(200), nullable=False)
     type = db.Column(db.String(50))
 
+# Parsed sanctions are cached per process and in a pickle next to the XML files,
+# keyed on the files' modification times, so requests only re-parse after an update
+ENTITIES_PICKLE = os.path.join('data', '.entities.pkl')
+_ENTITIES_CACHE = (None, [], None)  # (mtime fingerprint, entities, matcher)
+# app.run serves requests on several threads; only one of them may rebuild the cache
+_SANCTIONS_LOCK = threading.Lock()
+
+def _sanctions_fingerprint():
+    """Names and mtimes of the sanctions XML files"""
+    return tuple((path, os.stat(path).st_mtime_ns)
+                 for path in sorted(glob.glob(os.path.join('data', '*.xml'))))
+
+def get_sanctions_data():
+    """Return (entities, matcher), re-parsing only when the XML files change"""
+    fingerprint = _sanctions_fingerprint()
+    cache = _ENTITIES_CACHE
+    if cache[0] == fingerprint:
+        return cache[1], cache[2]
+    
+    with _SANCTIONS_LOCK:
+        # Another request may have rebuilt the cache while this one waited
+        fingerprint = _sanctions_fingerprint()
+        cache = _ENTITIES_CACHE
+        if cache[0] == fingerprint:
+            return cache[1], cache[2]
+        return _rebuild_sanctions_data(fingerprint)
+
+def _rebuild_sanctions_data(fingerprint):
+    """Load or re-parse the entities for fingerprint and swap them in; caller holds _SANCTIONS_LOCK"""
+    global _ENTITIES_CACHE
+    entities = None
+    try:
+        with open(ENTITIES_PICKLE, 'rb') as f:
+            cached_fingerprint, cached_entities = pickle.load(f)
+        if cached_fingerprint == fingerprint:
+            entities = cached_entities
+            print(f"✅ Loaded {len(entities)} entities from cache")
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+    
+    if entities is None:
+        # A fresh parser per rebuild: parse_all_sanctions fills and returns instance state
+        entities = RobustSanctionsParser().parse_all_sanctions()
+        _write_entities_pickle(fingerprint, entities)
+    
+    matcher = OptimalFuzzyMatcher(entities)
+    _ENTITIES_CACHE = (fingerprint, entities, matcher)
+    return entities, matcher
+
+def _write_entities_pickle(fingerprint, entities):
+    """Write the pickle to a temp file beside it, then swap it in so readers never see a partial file"""
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(ENTITIES_PICKLE), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((fingerprint, entities), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, ENTITIES_PICKLE)
+    except (OSError, pickle.PicklingError) as e:
+        print(f"⚠️ Could not write sanctions cache: {e}")
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
 # Login required decorator
 def login_required(f):
     @wraps(f)
@@ -54,6 +128,9 @@ def index():
 def login():
     if request.method == 'POST':
         password = request.form.get('password')
+        if not password or len(password) > MAX_PASSWORD_LENGTH:
+            flash('Invalid password.', 'error')
+            return render_template('login.html')
         user = User.query.filter_by(username='admin').first()
         if user and user.check_password(password):
             session['user_id'] = user.id
@@ -97,13 +174,8 @@ def check_sanctions():
         if not client_name:
             return jsonify({'error': 'Client name is required'}), 400
         
-        # Import and use the sanctions system
-        from robust_sanctions_parser import RobustSanctionsParser
-        from advanced_fuzzy_matcher import OptimalFuzzyMatcher
-        
-        parser = RobustSanctionsParser()
-        entities = parser.parse_all_sanctions()
-        matcher = OptimalFuzzyMatcher(entities)
+        # Use the cached sanctions system (re-parsed only when the XML files change)
+        entities, matcher = get_sanctions_data()
         matches = matcher.find_matches(client_name, threshold=70)
         
         print(f"✅ Found {len(matches)} matches for '{client_name}'")
@@ -123,9 +195,7 @@ def check_sanctions():
 @app.route('/sanctions-stats')
 def sanctions_stats():
     try:
-        from robust_sanctions_parser import RobustSanctionsParser
-        parser = RobustSanctionsParser()
-        entities = parser.parse_all_sanctions()
+        entities, _ = get_sanctions_data()
         return jsonify({
             'status': 'active',
             'entities_loaded': len(entities),
@@ -134,12 +204,35 @@ def sanctions_stats():
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)})
 
+@app.route('/reload-sanctions', methods=['POST'])
+@login_required
+def reload_sanctions():
+    """Drop the cached entities and matcher and re-parse the XML files"""
+    global _ENTITIES_CACHE
+    try:
+        # Hold the rebuild lock throughout so lookups and other reloads wait for the new data
+        with _SANCTIONS_LOCK:
+            _ENTITIES_CACHE = (None, [], None)
+            try:
+                os.remove(ENTITIES_PICKLE)
+            except FileNotFoundError:
+                pass
+            entities, _ = _rebuild_sanctions_data(_sanctions_fingerprint())
+        return jsonify({
+            'status': 'reloaded',
+            'entities_loaded': len(entities),
+            'message': f'Reloaded {len(entities)} sanction entities'
+        })
+    except Exception as e:
+        print(f"❌ Reload error: {e}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
 # Initialize database
 with app.app_context():
     db.create_all()
     admin = User.query.filter_by(username='admin').first()
     if not admin:
-        admin = User(username='admin', password_hash=generate_password_hash('admin123'))
+        admin = User(username='admin', password_hash=generate_password_hash('admin123', method=BOOTSTRAP_ADMIN_HASH_METHOD))
         db.session.add(admin)
         db.session.commit()
         print("✅ Admin user created (password: admin123)")
@@ -0,0 +1,138 @@
+"""
+Tests for the convert_sanctions.py command-line converter.
+
+Small workbooks are written to a temporary directory, converted, and the
+CSV rows read back. The .xlsx path streams with openpyxl; every other
+spreadsheet suffix goes through pandas.read_excel, exercised here with an
+.ods file since odfpy is a project requirement (reading real .xls files
+would also need xlrd).
+"""
+import unittest
+import sys
+import os
+import csv
+import tempfile
+
+# Add parent directory to path to import the converter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from openpyxl import Workbook
+
+from convert_sanctions import convert_excel_to_csv, convert_xml_to_csv, CSV_COLUMNS
+
+
+class ConverterTestCase(unittest.TestCase):
+    """Temporary directory plus a helper to read the converted CSV back"""
+
+    def setUp(self):
+        """Give each test its own scratch directory"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_csv = os.path.join(self.tmp_dir.name, 'out.csv')
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        self.tmp_dir.cleanup()
+
+    def path(self, filename):
+        """Path of a file inside the scratch directory"""
+        return os.path.join(self.tmp_dir.name, filename)
+
+    def read_output(self):
+        """Converted CSV as a list of rows, header included"""
+        with open(self.output_csv, newline='', encoding='utf-8') as f:
+            return list(csv.reader(f))
+
+
+class TestConvertXlsx(ConverterTestCase):
+    """Tests for the streamed .xlsx path"""
+
+    def write_xlsx(self, filename, rows):
+        """Save rows (header first) to a one-sheet workbook"""
+        wb = Workbook()
+        ws = wb.active
+        for row in rows:
+            ws.append(row)
+        wb.save(self.path(filename))
+        return self.path(filename)
+
+    def test_columns_detected_and_info_rebuilt(self):
+        """Test that ID and name columns are found and other columns fill additional_info"""
+        xlsx = self.write_xlsx('list.xlsx', [
+            ['Reference', 'Full Name', 'Nationality', 'Listed On', 'Regime', 'Comments'],
+            ['UK-001', 'John Doe', 'Narnia', '2020-01-01', 'Test Regime', 'dropped: fourth field'],
+            ['UK-002', 'Jane Roe', None, '2021-05-05', None, 'Note'],
+        ])
+        self.assertTrue(convert_excel_to_csv(xlsx, self.output_csv))
+        self.assertEqual(self.read_output(), [
+            CSV_COLUMNS,
+            ['UK-001', 'John Doe', 'Nationality: Narnia | Listed On: 2020-01-01 | Regime: Test Regime'],
+            ['UK-002', 'Jane Roe', 'Listed On: 2021-05-05 | Comments: Note'],
+        ])
+
+    def test_missing_id_column_and_cells_fall_back(self):
+        """Test generated IDs without an ID column and placeholder names for empty cells"""
+        xlsx = self.write_xlsx('no_ids.xlsx', [
+            ['Name', 'Country'],
+            ['Acme Trading', 'Atlantis'],
+            [None, 'Lemuria'],
+        ])
+        self.assertTrue(convert_excel_to_csv(xlsx, self.output_csv))
+        self.assertEqual(self.read_output(), [
+            CSV_COLUMNS,
+            ['ROW_0', 'Acme Trading', 'Country: Atlantis'],
+            ['ROW_1', 'Entry_1', 'Country: Lemuria'],
+        ])
+
+    def test_quotes_and_commas_survive_csv_writer(self):
+        """Test that names with commas, quotes and newlines round-trip through the CSV"""
+        name = 'Smith, John "The Banker"\nJr'
+        xlsx = self.write_xlsx('quoted.xlsx', [['ID', 'Name'], ['X-1', name]])
+        self.assertTrue(convert_excel_to_csv(xlsx, self.output_csv))
+        self.assertEqual(self.read_output(), [CSV_COLUMNS, ['X-1', name, '']])
+
+    def test_header_only_sheet(self):
+        """Test that a sheet with no data rows still writes the CSV header"""
+        xlsx = self.write_xlsx('empty.xlsx', [['ID', 'Name']])
+        self.assertTrue(convert_excel_to_csv(xlsx, self.output_csv))
+        self.assertEqual(self.read_output(), [CSV_COLUMNS])
+
+
+class TestConvertPandasSpreadsheet(ConverterTestCase):
+    """Tests for the pandas path used by non-.xlsx spreadsheets"""
+
+    def test_empty_cells_skipped(self):
+        """Test that NaN cells become None, so they fall back or drop out of additional_info"""
+        ods = self.path('list.ods')
+        pd.DataFrame({
+            'DataID': ['UN-1', None],
+            'Individual': ['Ivan Petrov', 'Li Wei'],
+            'Nationality': [None, 'Cathay'],
+        }).to_excel(ods, index=False, engine='odf')
+        self.assertTrue(convert_excel_to_csv(ods, self.output_csv))
+        self.assertEqual(self.read_output(), [
+            CSV_COLUMNS,
+            ['UN-1', 'Ivan Petrov', ''],
+            ['ROW_1', 'Li Wei', 'Nationality: Cathay'],
+        ])
+
+
+class TestConvertXml(ConverterTestCase):
+    """Tests for XML conversion output"""
+
+    def test_un_individuals(self):
+        """Test UN-style INDIVIDUAL records are written through the csv writer"""
+        xml_file = self.path('un.xml')
+        with open(xml_file, 'w', encoding='utf-8') as f:
+            f.write(
+                '<CONSOLIDATED_LIST><INDIVIDUALS>'
+                '<INDIVIDUAL><DATAID>6908555</DATAID><FIRST_NAME>ABDUL</FIRST_NAME>'
+                '<SECOND_NAME>RAHMAN</SECOND_NAME><COMMENTS1>Listed, see notes</COMMENTS1></INDIVIDUAL>'
+                '</INDIVIDUALS></CONSOLIDATED_LIST>'
+            )
+        self.assertTrue(convert_xml_to_csv(xml_file, self.output_csv))
+        self.assertEqual(self.read_output(), [CSV_COLUMNS, ['6908555', 'ABDUL RAHMAN', 'Listed, see notes']])
+
+
+if __name__ == '__main__':
+    unittest.main()
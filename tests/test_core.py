@@ -3,9 +3,7 @@ from app import app, db
 from models import User, Log, Individual
 from utils import perform_screening, generate_pdf_report, log_activity, update_sanctions_lists
 from routes import login_required
-from flask import session
 from datetime import date
-import os
 
 @pytest.fixture
 def client():
@@ -13,17 +13,19 @@ import os
 # Add parent directory to path to import from app
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.sanctions_service import SanctionsService
+from app.sanctions_service import SanctionsService, PARSER_VERSION
 
 
 class TestFormatDetection(unittest.TestCase):
     """Tests for the _detect_format method in SanctionsService"""
     
-    def setUp(self):
-        """Create a SanctionsService instance for testing without loading data"""
-        # Patch the initialization to skip loading actual files
+    @classmethod
+    def setUpClass(cls):
+        """Create one SanctionsService for all tests without loading data"""
+        # Patch the initialization to skip loading actual files; _detect_format
+        # is stateless, so a single instance serves every test
         with unittest.mock.patch.object(SanctionsService, '_load_or_parse_sanctions'):
-            self.service = SanctionsService(data_dir='/nonexistent')
+            cls.service = SanctionsService(data_dir='/nonexistent')
     
     def test_detect_eu_format_by_namespace(self):
         """Test EU format detection via namespace"""
@@ -169,7 +171,6 @@ class TestFormatDetectionIntegration(unittest.TestCase):
     
     def test_parser_version_incremented(self):
         """Test that parser version was incremented for cache invalidation"""
-        from app.sanctions_service import PARSER_VERSION
         self.assertGreaterEqual(PARSER_VERSION, 3, 
             "Parser version should be at least 3 after format detection changes")
 
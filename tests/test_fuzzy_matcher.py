@@ -0,0 +1,204 @@
+"""
+Tests for batched scoring in the OptimalFuzzyMatcher classes.
+
+find_matches_batch should agree with the token-set strategy of
+find_matches while scoring all queries in a single pass, and the
+service matcher's match_entity should keep its filtering rules while
+scoring every indexed name at once. The enhanced matcher behind
+/check_sanctions is exercised on a synthetic list, so none of these
+tests touch the XML sanctions files.
+"""
+import unittest
+from unittest import mock
+import sys
+import os
+
+# Add parent directory to path to import from app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rapidfuzz import fuzz
+from rapidfuzz.utils import default_process
+
+from app.advanced_fuzzy_matcher import OptimalFuzzyMatcher
+from app.sanctions_service import OptimalFuzzyMatcher as ServiceFuzzyMatcher
+import app.enhanced_matcher as enhanced_matcher
+from app.enhanced_matcher import EnhancedSanctionsMatcher
+
+
+def synthetic_entities():
+    """Small sanctions list shared by every matcher under test (fresh copy per call)"""
+    return [
+        {'id': 'EU-1', 'primary_name': 'Vladimir Putin', 'names': ['Vladimir Putin', 'Vladimir Vladimirovich Putin'],
+         'source': 'EU', 'list_type': 'EU', 'type': 'individual'},
+        {'id': 'UN-1', 'primary_name': 'Kim Jong Un', 'names': ['Kim Jong Un'],
+         'source': 'UN', 'list_type': 'UN', 'type': 'individual'},
+        {'id': 'UK-1', 'primary_name': 'Islamic State in Iraq', 'names': ['Islamic State in Iraq'],
+         'source': 'UK', 'list_type': 'UK', 'type': 'entity'},
+        {'id': 'OFAC-1', 'primary_name': 'Kim Jong Un', 'names': ['Kim Jong Un'],
+         'source': 'OFAC', 'list_type': 'OFAC', 'type': 'individual'},
+        {'id': 'UK-2', 'primary_name': 'Putin Holdings Ltd', 'names': ['Putin Holdings Ltd'],
+         'source': 'UK', 'list_type': 'UK', 'type': 'entity'},
+        {'id': 'OFAC-2', 'primary_name': 'AEROCARIBBEAN AIRLINES', 'names': ['AERO-CARIBBEAN'],
+         'source': 'OFAC', 'list_type': 'OFAC', 'type': 'entity'},
+        {'id': 'OFAC-3', 'primary_name': 'BANK OF CHINA', 'names': [],
+         'source': 'OFAC', 'list_type': 'OFAC', 'type': 'entity'},
+        {'id': 'UN-2', 'primary_name': 'Bank of China', 'names': [],
+         'source': 'UN', 'list_type': 'UN', 'type': 'entity'},
+        {'id': 'UK-3', 'primary_name': 'STANDARD CHARTERED', 'names': [],
+         'source': 'UK', 'list_type': 'UK', 'type': 'entity'},
+    ]
+
+
+class TestFindMatchesBatch(unittest.TestCase):
+    """Tests for the find_matches_batch method"""
+    
+    def setUp(self):
+        """Build a matcher over the synthetic sanctions list"""
+        self.matcher = OptimalFuzzyMatcher(synthetic_entities())
+    
+    def test_one_result_list_per_query(self):
+        """Test that every query gets its own result list, in order"""
+        results = self.matcher.find_matches_batch(['Putin Vladimir', 'Nobody Here', ''], threshold=70)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0][0]['primary_name'], 'Vladimir Putin')
+        self.assertEqual(results[0][0]['score'], 100)
+        self.assertEqual(results[1], [])
+        self.assertEqual(results[2], [])
+    
+    def test_scores_match_token_set_ratio(self):
+        """Test that batched scores equal token_set_ratio with default preprocessing"""
+        query = 'islamic state of iraq'
+        results = self.matcher.find_matches_batch([query], threshold=0)
+        for match in results[0]:
+            expected = fuzz.token_set_ratio(query, match['primary_name'].lower(), processor=default_process)
+            self.assertEqual(match['score'], expected)
+    
+    def test_duplicate_names_keep_first_entity(self):
+        """Test that a name listed by several sources is reported once"""
+        results = self.matcher.find_matches_batch(['Kim Jong Un'], threshold=90)
+        self.assertEqual(len(results[0]), 1)
+        self.assertEqual(results[0][0]['id'], 'UN-1')
+    
+    def test_score_rounding_up_to_threshold_matches(self):
+        """Test that a name scoring just under the threshold still matches once rounded"""
+        query = 'Putin Vladimirovich'
+        raw = fuzz.token_set_ratio(query.lower(), 'vladimir putin', processor=default_process)
+        self.assertLess(raw, 85)
+        batched = self.matcher.find_matches_batch([query], threshold=85)[0]
+        single = self.matcher.find_matches(query, threshold=85)
+        self.assertEqual([m['id'] for m in batched], ['EU-1'])
+        self.assertIn('EU-1', [m['id'] for m in single])
+        self.assertEqual(self.matcher.find_matches_batch([query], threshold=86), [[]])
+    
+    def test_empty_index(self):
+        """Test batching against a matcher with no entities"""
+        matcher = OptimalFuzzyMatcher([])
+        self.assertEqual(matcher.find_matches_batch(['anyone']), [[]])
+        self.assertEqual(matcher.find_matches_batch([]), [])
+
+
+class TestServiceMatchEntity(unittest.TestCase):
+    """Tests for SanctionsService's OptimalFuzzyMatcher.match_entity"""
+    
+    def setUp(self):
+        """Build a matcher over the synthetic list, where some entities have several names"""
+        self.matcher = ServiceFuzzyMatcher(synthetic_entities())
+    
+    def test_scores_are_best_of_sort_and_set_ratio(self):
+        """Test that each match carries max(token_sort_ratio, token_set_ratio)"""
+        query = 'putin vladimir'
+        matches = self.matcher.match_entity(query, threshold=70)
+        self.assertTrue(matches)
+        for match in matches:
+            target = match['matched_name'].lower()
+            expected = max(fuzz.token_sort_ratio(query, target, processor=default_process),
+                           fuzz.token_set_ratio(query, target, processor=default_process))
+            self.assertEqual(match['score'], expected)
+    
+    def test_entity_reported_once(self):
+        """Test that an entity matching on several names is returned once"""
+        matches = self.matcher.match_entity('Vladimir Putin', threshold=70)
+        sources = [match['entity']['source'] for match in matches]
+        self.assertEqual(sources.count('EU'), 1)
+        self.assertEqual(matches[0]['score'], 100.0)
+    
+    def test_entity_type_filter(self):
+        """Test that individual screening skips entity-type records"""
+        matches = self.matcher.match_entity('Putin', entity_type='individual', threshold=60)
+        self.assertNotIn('UK', [match['entity']['source'] for match in matches])
+    
+    def test_score_rounding_up_to_threshold_matches(self):
+        """Test that a best score just under the threshold still matches once rounded"""
+        matcher = ServiceFuzzyMatcher([{'names': ['Vladimir Putin'], 'type': 'individual', 'source': 'EU'}])
+        matches = matcher.match_entity('Putin Vladimirovich', threshold=85)
+        self.assertEqual(len(matches), 1)
+        self.assertLess(matches[0]['score'], 85)
+        self.assertEqual(matcher.match_entity('Putin Vladimirovich', threshold=86), [])
+    
+    def test_empty_index(self):
+        """Test matching against no sanctions entities"""
+        self.assertEqual(ServiceFuzzyMatcher([]).match_entity('anyone'), [])
+
+
+class TestEnhancedMatcher(unittest.TestCase):
+    """Tests for EnhancedSanctionsMatcher over a synthetic sanctions list"""
+    
+    def setUp(self):
+        """Build the matcher directly from the synthetic list"""
+        self.matcher = EnhancedSanctionsMatcher(synthetic_entities())
+    
+    def tearDown(self):
+        """Drop anything the cached lookups stored"""
+        enhanced_matcher._score_name.cache_clear()
+    
+    def test_exact_match_after_normalization(self):
+        """Test that case and punctuation differences still give an exact match"""
+        matches = self.matcher.find_matches('aerocaribbean airlines!')
+        self.assertEqual(matches[0]['matched_name'], 'AEROCARIBBEAN AIRLINES')
+        self.assertEqual(matches[0]['match_layer'], 'exact')
+        self.assertEqual(matches[0]['score'], 100.0)
+    
+    def test_multi_jurisdictional_match(self):
+        """Test that a name listed by several authorities is flagged as such"""
+        matches = self.matcher.find_matches('Bank of China')
+        self.assertEqual(len(matches), 2)
+        for match in matches:
+            self.assertTrue(match['is_multi_jurisdictional'])
+    
+    def test_fuzzy_layers_agree_with_pairwise_scoring(self):
+        """Test that batched layer 3/4 scores equal the per-pair layer methods"""
+        query = self.matcher._normalize_name('Standard Charterd Bank')
+        query_tokens = self.matcher._tokenize(query)
+        expected = None
+        for entry in self.matcher.name_index:
+            if entry['original_name'] == 'STANDARD CHARTERED':
+                expected = (self.matcher._layer3_phonetic_match(query, query_tokens, entry['normalized'], entry['tokens'])
+                            or self.matcher._layer4_fuzzy_match(query, entry['normalized']))
+        matches = self.matcher.find_matches('Standard Charterd Bank')
+        self.assertEqual(matches[0]['score'], round(expected, 1))
+    
+    def test_fuzzy_layer_floor_reached_by_rounding(self):
+        """Test that a raw token_set_ratio just under 70 still reaches layer 4"""
+        query = self.matcher._normalize_name('Standard Puttin')
+        raw = fuzz.token_set_ratio(query, 'standard chartered', processor=default_process)
+        self.assertLess(raw, 70)
+        matches = self.matcher.find_matches('Standard Puttin')
+        self.assertEqual(matches[0]['matched_name'], 'STANDARD CHARTERED')
+        self.assertEqual(matches[0]['match_layer'], 'fuzzy')
+        self.assertEqual(matches[0]['score'], 70.0)
+    
+    def test_cached_matches_invalidated_by_version(self):
+        """Test that find_matches_cached reuses results until the data version changes"""
+        enhanced_matcher._score_name.cache_clear()
+        with mock.patch.object(enhanced_matcher, '_matcher_instance', self.matcher):
+            first = enhanced_matcher.find_matches_cached('BANK OF CHINA')
+            second = enhanced_matcher.find_matches_cached('bank of china')
+            self.assertEqual(first, second)
+            self.assertEqual(enhanced_matcher._score_name.cache_info().hits, 1)
+            with mock.patch.object(enhanced_matcher, '_matcher_version', enhanced_matcher._matcher_version + 1):
+                enhanced_matcher.find_matches_cached('bank of china')
+            self.assertEqual(enhanced_matcher._score_name.cache_info().misses, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
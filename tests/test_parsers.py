@@ -3,7 +3,6 @@ from io import StringIO, BytesIO
 import xml.etree.ElementTree as ET
 import pandas as pd
 import csv
-import re
 
 # Copy parsers from app.py for independent testing
 def parse_un_xml(data, source):
@@ -4,10 +4,12 @@ import logging
 from xml.etree import ElementTree as ET
 import hashlib
 from datetime import datetime
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz
+from rapidfuzz.utils import default_process
 from jinja2 import Environment, FileSystemLoader
 from weasyprint import HTML
 from flask import request
+from sqlalchemy import insert, select
 
 from .extensions import db
 from .models import Individual, Entity, Alias, Address, Sanction, Log
@@ -16,6 +18,13 @@ logging.basicConfig(level=logging.ERROR)
 
 DATA_DIR = 'data'
 
+SANCTIONS_FILES = {
+    'un_consolidated.xml': 'un',
+    'uk_consolidated.xml': 'uk',
+    'eu_consolidated.xml': 'eu',
+    'ofac_consolidated.xml': 'ofac',
+}
+
 def ensure_data_dir():
     if not os.path.exists(DATA_DIR):
         os.makedirs(DATA_DIR)
@@ -91,14 +100,8 @@ def parse_xml(filepath, source):
 
 def update_sanctions_lists():
     ensure_data_dir()
-    files = {
-        'un_consolidated.xml': 'un',
-        'uk_consolidated.xml': 'uk',
-        'eu_consolidated.xml': 'eu',
-        'ofac_consolidated.xml': 'ofac',
-    }
     data = {}
-    for filename, source in files.items():
+    for filename, source in SANCTIONS_FILES.items():
         filepath = os.path.join(DATA_DIR, filename)
         if not os.path.exists(filepath):
             raise ValueError(f"Missing sanctions file: {filename}. Please download manually from official sources, rename as specified, and place in {DATA_DIR}/ folder.")
@@ -107,9 +110,11 @@ def update_sanctions_lists():
 
 def incorporate_to_db(parsed_data):
     try:
+        # One transaction for the whole import: commits once on exit, rolls back on error
         with db.session.begin():
+            individual_rows, individual_entries = [], []
             for filename, entries in parsed_data.items():
-                source = files[filename]  # From above dict
+                source = SANCTIONS_FILES[filename]
                 for entry in entries:
                     ref = entry.get('ref', '').strip()
                     name = entry.get('name', '').strip()
@@ -131,25 +136,38 @@ def incorporate_to_db(parsed_data):
                         except ValueError:
                             pass
                     if entry['type'] in ['individual', 'mixed']:
-                        ind = Individual(reference_number=ref, name=name, dob=dob,
-                                         nationality=entry.get('nationality', '').strip()[:100],
-                                         listed_on=listed_on, source=source)
-                        db.session.add(ind)
-                        db.session.flush()
-                        for alias_name in entry.get('aliases', []):
-                            alias_name = alias_name.strip()[:255]
-                            if alias_name:
-                                db.session.add(Alias(individual_id=ind.id, alias_name=alias_name))
-                        for addr in entry.get('addresses', []):
-                            address_str = ', '.join(filter(None, [a.strip() if a else '' for a in addr]))[:255]
-                            country = addr[2].strip()[:100] if len(addr) > 2 else ''
-                            if address_str:
-                                db.session.add(Address(individual_id=ind.id, address=address_str, country=country))
-                        if entry.get('description'):
-                            desc = entry['description'].strip()[:5000]  # Limit text
-                            db.session.add(Sanction(individual_id=ind.id, description=desc))
+                        individual_rows.append({
+                            'reference_number': ref, 'name': name, 'dob': dob,
+                            'nationality': entry.get('nationality', '').strip()[:100],
+                            'listed_on': listed_on, 'source': source,
+                        })
+                        individual_entries.append(entry)
                     # Add Entity handling if entry['type'] == 'entity' (similar)
-            db.session.commit()
+            if not individual_rows:
+                return
+            # Core bulk inserts: one executemany per table instead of a flush per individual.
+            # RETURNING in parameter order gives each entry its new primary key.
+            ids = db.session.scalars(
+                insert(Individual).returning(Individual.id, sort_by_parameter_order=True),
+                individual_rows
+            ).all()
+            alias_rows, address_rows, sanction_rows = [], [], []
+            for ind_id, entry in zip(ids, individual_entries):
+                for alias_name in entry.get('aliases', []):
+                    alias_name = alias_name.strip()[:255]
+                    if alias_name:
+                        alias_rows.append({'individual_id': ind_id, 'alias_name': alias_name})
+                for addr in entry.get('addresses', []):
+                    address_str = ', '.join(filter(None, [a.strip() if a else '' for a in addr]))[:255]
+                    country = addr[2].strip()[:100] if len(addr) > 2 else ''
+                    if address_str:
+                        address_rows.append({'individual_id': ind_id, 'address': address_str, 'country': country})
+                if entry.get('description'):
+                    desc = entry['description'].strip()[:5000]  # Limit text
+                    sanction_rows.append({'individual_id': ind_id, 'description': desc})
+            for model, rows in ((Alias, alias_rows), (Address, address_rows), (Sanction, sanction_rows)):
+                if rows:
+                    db.session.execute(insert(model), rows)
     except Exception as e:
         db.session.rollback()
         raise ValueError(f"DB insert error: {str(e)}")
@@ -163,15 +181,20 @@ def perform_screening(client_data):
         if not name:
             raise ValueError("Client name required for screening.")
         matches = []
-        candidates = Individual.query.filter(Individual.name.ilike(f'%{name}%')).all()
+        # Plain row tuples: only four columns are read, so skip ORM instance construction
+        candidates = db.session.execute(
+            select(Individual.id, Individual.name, Individual.dob, Individual.nationality)
+            .where(Individual.name.ilike(f'%{name}%'))
+        ).all()
         for cand in candidates:
-            name_score = fuzz.token_sort_ratio(name, cand.name.lower())
+            # Whole-number scores, as fuzzywuzzy returned them, keep the 82 cut-off unchanged
+            name_score = round(fuzz.token_sort_ratio(name, cand.name, processor=default_process))
             score = name_score
             if dob and cand.dob:
                 dob_score = 100 if cand.dob == dob else 0
                 score = (score + dob_score) / 2
             if nationality and cand.nationality:
-                nat_score = fuzz.ratio(nationality, cand.nationality.lower())
+                nat_score = round(fuzz.ratio(nationality, cand.nationality.lower()))
                 score = (score + nat_score) / 2 if len([score, nat_score]) > 1 else score
             if score >= 82:
                 matches.append({'id': cand.id, 'name': cand.name, 'score': score})